@@ -2,13 +2,17 @@
 import os
 import sys
 import time
+import mmap
 import hashlib
-import subprocess
-import re
+import ssl
 import argparse
 import warnings
 import shutil
+import queue
+import threading
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
 
 # Optional imports – used only in certain download modes
 try:
@@ -28,6 +32,10 @@ MANIFEST_NAME = "manifest.txt"
 # Chunk size: 1 GiB
 CHUNK_SIZE_BYTES = 1 * 1024 * 1024 * 1024
 
+# HTTP streaming read size. 1 MiB keeps the Python-level loop to ~1000
+# iterations per GiB instead of ~20000 with requests' smaller defaults.
+HTTP_READ_SIZE = 1 << 20
+
 # =========================
 # Progress bar helper
 # =========================
@@ -47,117 +55,351 @@ def draw_progress(prefix, current, total, bar_length=40):
         sys.stdout.flush()
 
 # =========================
-# Curl helpers
+# DMS / WebDAV helpers
 # =========================
+# All DMS traffic goes through one requests.Session so the HTTPS
+# connection (TCP + TLS handshake) is set up once and kept alive,
+# instead of spawning a curl process per call.
 
-def build_login_detail(username, password):
-    # Wrap in quotes to be used directly in -u
-    return f'"{username}:{password}"'
+def make_session(username, password):
+    if requests is None:
+        raise RuntimeError("requests not installed; needed for DMS transfers.")
+    session = requests.Session()
+    session.auth = (username, password)
+    return session
 
-def execute_curl_with_progress(curl_command, label):
+def dms_status(session, remote_dir_url):
     """
-    Run curl, parsing stderr for "XX.X%" progress and showing a per-file bar.
+    Fetch a WebDAV collection's free quota and file listing with a single
+    PROPFIND Depth: 1 — the quota comes back on the collection's own
+    response, the listing on its children, so the producer's upload gate
+    costs one round trip instead of two.
+    Returns (avail_bytes, {filename: size_bytes}); avail_bytes is -1 if
+    the server omits quota, and the listing is None if the request failed
+    (sizes are -1 where omitted).
     """
-    process = subprocess.Popen(
-        curl_command,
-        shell=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        universal_newlines=True,
+    data = (
+        '<?xml version="1.0"?><propfind xmlns="DAV:"><prop>'
+        '<quota-available-bytes/><getcontentlength/></prop></propfind>'
     )
     try:
-        for line in process.stderr:
-            match = re.search(r'(\d+(\.\d+)?)%', line)
-            if match:
-                progress = float(match.group(1))
-                draw_progress(label, progress, 100.0)
-        return_code = process.wait()
-        if return_code == 0:
-            print(f"{label}: done.")
-        else:
-            print(f"{label}: curl returned non-zero exit code {return_code}")
-    except Exception as e:
-        print(f"{label}: error running curl: {e}")
+        resp = session.request(
+            "PROPFIND",
+            remote_dir_url,
+            headers={"Depth": "1", "Content-Type": "application/xml"},
+            data=data,
+            timeout=30,
+        )
+        resp.raise_for_status()
+        tree = ET.fromstring(resp.content)
+        ns = {"d": "DAV:"}
+        avail_bytes = -1
+        listing = {}
+        for response in tree.findall("d:response", ns):
+            href = response.find("d:href", ns)
+            if href is None or not href.text:
+                continue
+            if href.text.endswith("/"):
+                # the collection itself (or a sub-collection) carries quota
+                avail = response.find(".//d:quota-available-bytes", ns)
+                try:
+                    avail_bytes = int(avail.text)
+                except (AttributeError, TypeError, ValueError):
+                    pass
+                continue
+            name = unquote(href.text.rsplit("/", 1)[-1])
+            length = response.find(".//d:getcontentlength", ns)
+            try:
+                size = int(length.text)
+            except (AttributeError, TypeError, ValueError):
+                size = -1
+            listing[name] = size
+        return avail_bytes, listing
+    except Exception:
+        return -1, None
+
+def dms_list(session, remote_dir_url):
+    """File listing of a WebDAV collection, or None if the request failed."""
+    return dms_status(session, remote_dir_url)[1]
 
-def curl_http_code(curl_command):
+# Marker files that producer/consumer exchange to signal state changes.
+# ready_<chunk>: upload of <chunk> finished; ack_<chunk>: chunk consumed.
+READY_PREFIX = "ready_"
+ACK_PREFIX = "ack_"
+
+def poll_dms_listing(session, remote_dir_url, fname, until_present, gone_fname=None):
     """
-    Run curl and return only the HTTP status code as string.
+    Poll the collection listing until `fname` appears (until_present=True)
+    or disappears (False). One PROPFIND per poll covers every file in the
+    folder, instead of a HEAD request per chunk per poll. Polling backs
+    off exponentially from 200 ms, so transitions are usually caught
+    within a few hundred ms on the keep-alive session while idle waits
+    settle at one request per 5 s.
+
+    If `gone_fname` is given, that file disappearing from the listing also
+    satisfies the wait: the notebook consumer predates the ack_ markers and
+    signals consumption only by deleting the chunk itself.
+
+    Returns the listing that satisfied the wait (None if the wait was
+    satisfied by a failed listing).
     """
+    delay = 0.2
+    while True:
+        listing = dms_list(session, remote_dir_url)
+        if listing is not None:
+            if (fname in listing) == until_present:
+                return listing
+            if gone_fname is not None and gone_fname not in listing:
+                return listing
+        elif not until_present:
+            # Listing failed; assume gone (matches the old HEAD-poll behaviour
+            # of treating request errors as "not found").
+            return None
+        time.sleep(delay)
+        delay = min(delay * 2, 5.0)
+
+def dms_put_marker(session, url):
+    """PUT a zero-byte marker file."""
     try:
-        result = subprocess.check_output(curl_command, shell=True)
-        return result.decode().strip()
-    except subprocess.CalledProcessError:
-        return ""
-
-# =========================
-# DMS / WebDAV helpers
-# =========================
-
-def dms_exists(login_detail, url):
-    curl_command = (
-        f'curl -u {login_detail} -o /dev/null -s '
-        f'-w "%{{http_code}}" -I "{url}"'
-    )
-    status_code = curl_http_code(curl_command)
-    return status_code == "200"
+        resp = session.put(url, data=b"", timeout=30)
+        resp.raise_for_status()
+    except Exception as e:
+        print(f"Error writing marker {url}: {e}")
 
-def dms_mkcol(login_detail, remote_dir_url):
-    curl_command = f'curl -u {login_detail} -s -o /dev/null -X MKCOL "{remote_dir_url}"'
-    subprocess.call(curl_command, shell=True)
+def dms_mkcol(session, remote_dir_url):
+    try:
+        session.request("MKCOL", remote_dir_url, timeout=30)
+    except requests.RequestException:
+        pass
 
-def dms_delete(login_detail, url, label=None):
-    curl_command = f'curl -u {login_detail} -s -o /dev/null -X DELETE "{url}"'
+def dms_delete(session, url, label=None):
     try:
-        subprocess.check_output(curl_command, shell=True)
+        resp = session.delete(url, timeout=30)
+        # Already gone is as good as deleted (markers may be cleaned up by
+        # either side, whichever gets there first).
+        if resp.status_code != 404:
+            resp.raise_for_status()
         if label:
             print(f"Deleted from DMS: {label}")
     except Exception as e:
         print(f"Error deleting from DMS {label or url}: {e}")
 
-def dms_upload_file(login_detail, local_path, remote_url, label):
-    curl_command = (
-        f'curl -u {login_detail} --progress-bar '
-        f'-T "{local_path}" "{remote_url}"'
-    )
-    execute_curl_with_progress(curl_command, f"Upload {label}")
+class _ProgressFile:
+    """
+    File wrapper that draws an upload progress bar as requests reads it.
+    Exposes __len__ so requests sends Content-Length instead of chunked.
+    """
+    def __init__(self, path, label):
+        self._f = open(path, "rb")
+        self._label = label
+        self._size = os.path.getsize(path)
+        self._sent = 0
+
+    def __len__(self):
+        return self._size
+
+    def read(self, n=-1):
+        buf = self._f.read(n)
+        self._sent += len(buf)
+        draw_progress(self._label, self._sent, self._size)
+        return buf
+
+    def close(self):
+        self._f.close()
+
+def dms_upload_file(session, local_path, remote_url, label):
+    body = _ProgressFile(local_path, f"Upload {label}")
+    try:
+        resp = session.put(remote_url, data=body)
+        resp.raise_for_status()
+        print(f"Upload {label}: done.")
+    except Exception as e:
+        print(f"Upload {label}: error: {e}")
+    finally:
+        body.close()
 
-def dms_download_file(login_detail, remote_url, local_path, label):
-    curl_command = (
-        f'curl -u {login_detail} --progress-bar '
-        f'-o "{local_path}" "{remote_url}"'
-    )
-    execute_curl_with_progress(curl_command, f"Download {label}")
+def dms_download_file(session, remote_url, local_path, label):
+    try:
+        with session.get(remote_url, stream=True) as resp:
+            resp.raise_for_status()
+            total = int(resp.headers.get("Content-Length", 0)) or None
+            downloaded = 0
+            with open(local_path, "wb") as f:
+                for buf in resp.iter_content(chunk_size=HTTP_READ_SIZE):
+                    f.write(buf)
+                    downloaded += len(buf)
+                    draw_progress(f"Download {label}", downloaded, total)
+        print(f"Download {label}: done.")
+    except Exception as e:
+        print(f"Download {label}: error: {e}")
+
+def download_and_hash(session, remote_url, local_path, label, leaf_based=True):
+    """
+    Stream a remote file to disk while hashing each network buffer in the
+    same pass, so verification needs no second read of the chunk.
+    Returns (digest_hex, [raw leaf digests]) — the tree digest over
+    LEAF_SIZE leaves when leaf_based, else a plain whole-file SHA-256 with
+    an empty leaf list — or (None, []) if the download failed.
+    """
+    h = hashlib.sha256()
+    leaves = []
+    leaf_fill = 0
+    try:
+        with session.get(remote_url, stream=True) as resp:
+            resp.raise_for_status()
+            total = int(resp.headers.get("Content-Length", 0)) or None
+            downloaded = 0
+            with open(local_path, "wb") as f:
+                for buf in resp.iter_content(chunk_size=HTTP_READ_SIZE):
+                    f.write(buf)
+                    downloaded += len(buf)
+                    if not leaf_based:
+                        h.update(buf)
+                    else:
+                        # Re-slice network buffers onto LEAF_SIZE boundaries
+                        mv = memoryview(buf)
+                        while mv:
+                            take = min(LEAF_SIZE - leaf_fill, len(mv))
+                            h.update(mv[:take])
+                            leaf_fill += take
+                            mv = mv[take:]
+                            if leaf_fill == LEAF_SIZE:
+                                leaves.append(h.digest())
+                                h = hashlib.sha256()
+                                leaf_fill = 0
+                    draw_progress(f"Download {label}", downloaded, total)
+        print(f"Download {label}: done.")
+        if not leaf_based:
+            return h.hexdigest(), []
+        if leaf_fill:
+            leaves.append(h.digest())
+        return merkle_root(leaves), leaves
+    except Exception as e:
+        print(f"Download {label}: error: {e}")
+        return None, []
+
+def repair_chunk_leaves(session, remote_url, local_path, expected_leaves, actual_leaves, label):
+    """
+    Re-fetch only the corrupted leaves of a downloaded chunk with HTTP
+    Range requests and patch them in place. Returns True if every leaf
+    now matches the manifest.
+    """
+    if len(expected_leaves) != len(actual_leaves):
+        return False  # truncated/oversized download; needs a full retry
+    bad = [i for i, (e, a) in enumerate(zip(expected_leaves, actual_leaves)) if e != a]
+    size = os.path.getsize(local_path)
+    print(f"Re-fetching {len(bad)} corrupted leaf(s) of {label}...")
+    try:
+        with open(local_path, "r+b") as f:
+            for i in bad:
+                lo = i * LEAF_SIZE
+                hi = min(lo + LEAF_SIZE, size) - 1
+                resp = session.get(
+                    remote_url, headers={"Range": f"bytes={lo}-{hi}"}, timeout=60
+                )
+                resp.raise_for_status()
+                if resp.status_code != 206:
+                    return False  # server ignored the Range request
+                buf = resp.content
+                if hashlib.sha256(buf).digest() != expected_leaves[i]:
+                    return False
+                f.seek(lo)
+                f.write(buf)
+        return True
+    except Exception as e:
+        print(f"Leaf repair for {label} failed: {e}")
+        return False
 
 # =========================
 # Checksum helpers
 # =========================
 
-def sha256_file(path):
+# Chunks are hashed as a two-level tree: SHA-256 per 4 MiB leaf, and the
+# manifest digest is SHA-256 over the concatenated raw leaf digests. On a
+# mismatch the consumer can re-fetch just the bad leaves with Range
+# requests instead of re-downloading the whole 1 GiB chunk.
+LEAF_SIZE = 4 * 1024 * 1024
+
+def merkle_root(leaf_digests):
+    """Combine raw per-leaf digests into the chunk digest stored in the manifest."""
     h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for block in iter(lambda: f.read(4096), b""):
-            h.update(block)
+    for digest in leaf_digests:
+        h.update(digest)
     return h.hexdigest()
 
+def file_leaf_digests(path):
+    """Per-leaf SHA-256 digests of a file, LEAF_SIZE bytes per leaf."""
+    leaves = []
+    buf = bytearray(LEAF_SIZE)
+    view = memoryview(buf)
+    with open(path, "rb") as f:
+        # buffered readinto fills the whole leaf except at EOF, and reusing
+        # the buffer avoids a 4 MiB allocation per leaf
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            leaves.append(hashlib.sha256(view[:n]).digest())
+    return leaves
+
+def check_hash_acceleration():
+    """
+    Warn at startup if SHA-256 is unlikely to be hardware-accelerated.
+    hashlib normally dispatches to OpenSSL, which uses the SHA-NI (x86)
+    or ARMv8 sha2 instructions when the CPU has them; without either the
+    GiB-scale chunk hashing in this tool runs several times slower.
+    """
+    problems = []
+
+    if hashlib.sha256().__class__.__module__ != "_hashlib":
+        problems.append(
+            "hashlib.sha256 is Python's built-in fallback, not OpenSSL "
+            "(rebuild/install a Python linked against OpenSSL >= 1.1.1)"
+        )
+    elif ssl.OPENSSL_VERSION_INFO[:3] < (1, 1, 1):
+        problems.append(
+            f"old OpenSSL ({ssl.OPENSSL_VERSION}); versions before 1.1.1 "
+            "may miss the accelerated SHA-256 paths"
+        )
+
+    try:
+        with open("/proc/cpuinfo") as f:
+            cpu_flags = f.read()
+        # x86 advertises sha_ni, ARMv8 advertises sha2
+        if "sha_ni" not in cpu_flags and "sha2" not in cpu_flags:
+            problems.append(
+                "CPU does not advertise SHA extensions (sha_ni/sha2); "
+                "hashing will run on the generic SIMD path"
+            )
+    except OSError:
+        pass  # non-Linux; no cheap way to probe
+
+    for problem in problems:
+        print(f"⚠ Hashing performance: {problem}")
+
 # =========================
 # Storage & quota helpers
 # =========================
 
-def get_dms_quota(login_detail):
+def get_dms_quota(session):
     """
     Fetch DMS quota info via WebDAV PROPFIND.
     Returns (used_bytes, available_bytes) or (-1, -1) if failed.
     """
-    quota_url = DMS_BASE
-    headers = ' -H "Depth: 0" -H "Content-Type: application/xml" '
-    data = "'<?xml version=\"1.0\"?><propfind xmlns=\"DAV:\"><prop><quota-available-bytes/><quota-used-bytes/></prop></propfind>'"
-    curl_cmd = (
-        f"curl -u {login_detail} -s {headers} "
-        f"-X PROPFIND --data {data} \"{quota_url}\""
+    data = (
+        '<?xml version="1.0"?><propfind xmlns="DAV:"><prop>'
+        '<quota-available-bytes/><quota-used-bytes/></prop></propfind>'
     )
     try:
-        output = subprocess.check_output(curl_cmd, shell=True).decode()
-        tree = ET.fromstring(output)
+        resp = session.request(
+            "PROPFIND",
+            DMS_BASE,
+            headers={"Depth": "0", "Content-Type": "application/xml"},
+            data=data,
+            timeout=30,
+        )
+        resp.raise_for_status()
+        tree = ET.fromstring(resp.content)
         ns = {"d": "DAV:"}
         used = tree.find('.//d:quota-used-bytes', ns)
         avail = tree.find('.//d:quota-available-bytes', ns)
@@ -188,30 +430,171 @@ def get_remote_file_size(url):
 # Producer: download original file on VPS
 # =========================
 
-def download_regular_file(download_link, file_name):
+# Concurrent Range requests per download; each worker gets its own TCP
+# connection (and congestion window), which matters on per-connection-capped
+# mirrors.
+RANGE_DOWNLOAD_WORKERS = 8
+
+def _fetch_ranges(download_link, fd, lo, hi, progress=None, workers=RANGE_DOWNLOAD_WORKERS):
+    """
+    Fetch bytes [lo, hi) of `download_link` with concurrent Range requests,
+    each worker pwriting its segment into `fd` at (offset - lo).
+    `progress` is called with byte counts from the worker threads.
+    """
+    span = hi - lo
+    segment = (span + workers - 1) // workers
+
+    def fetch(start, end):
+        session = requests.Session()
+        headers = {"Range": f"bytes={start}-{end}"}
+        with session.get(download_link, headers=headers, stream=True, timeout=30) as resp:
+            resp.raise_for_status()
+            if resp.status_code != 206:
+                raise RuntimeError("server ignored the Range request")
+            offset = start
+            for buf in resp.iter_content(chunk_size=HTTP_READ_SIZE):
+                os.pwrite(fd, buf, offset - lo)
+                offset += len(buf)
+                if progress:
+                    progress(len(buf))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(fetch, start, min(start + segment, hi) - 1)
+            for start in range(lo, hi, segment)
+        ]
+        for future in futures:
+            future.result()
+
+def _ranged_download_into_chunks(download_link, base, chunks_dir, manifest_path,
+                                 total_size, chunk_size):
+    """
+    Fill one chunk file at a time with parallel Range requests, hashing
+    each finished (page-cache hot) chunk before moving to the next.
+    """
+    chunk_files = []
+    progress_lock = threading.Lock()
+    downloaded = 0
+
+    def on_bytes(n):
+        nonlocal downloaded
+        with progress_lock:
+            downloaded += n
+            draw_progress("Download+chunk", downloaded, total_size)
+
+    with open(manifest_path, "w") as mf:
+        for chunk_num, start in enumerate(range(0, total_size, chunk_size)):
+            end = min(start + chunk_size, total_size)
+            chunk_filename = f"{base}.part{chunk_num:03d}"
+            chunk_path = os.path.join(chunks_dir, chunk_filename)
+            fd = os.open(chunk_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                preallocate(fd, end - start)
+                _fetch_ranges(download_link, fd, start, end, progress=on_bytes)
+            finally:
+                os.close(fd)
+            leaves = file_leaf_digests(chunk_path)
+            leaves_hex = "".join(digest.hex() for digest in leaves)
+            mf.write(f"{merkle_root(leaves)}  {chunk_filename}  {leaves_hex}\n")
+            chunk_files.append(chunk_filename)
+    return chunk_files
+
+def _stream_download_into_chunks(download_link, base, chunks_dir, manifest_path,
+                                 chunk_size):
+    """
+    Single-stream fallback: cut the HTTP stream into chunk files on the
+    fly, hashing leaves as the bytes arrive.
+    """
+    chunk_files = []
+    chunk_num = 0
+    chunk_fill = 0
+    f_out = None
+    leaves = []
+    leaf_h = hashlib.sha256()
+    leaf_fill = 0
+    downloaded = 0
+
+    with requests.get(download_link, stream=True) as resp, open(manifest_path, "w") as mf:
+        resp.raise_for_status()
+        total = int(resp.headers.get("Content-Length", 0)) or None
+
+        def finish_chunk():
+            nonlocal f_out, leaves, leaf_h, leaf_fill, chunk_fill, chunk_num
+            if leaf_fill:
+                leaves.append(leaf_h.digest())
+            f_out.close()
+            leaves_hex = "".join(digest.hex() for digest in leaves)
+            mf.write(f"{merkle_root(leaves)}  {chunk_files[-1]}  {leaves_hex}\n")
+            f_out = None
+            leaves = []
+            leaf_h = hashlib.sha256()
+            leaf_fill = 0
+            chunk_fill = 0
+            chunk_num += 1
+
+        for buf in resp.iter_content(chunk_size=HTTP_READ_SIZE):
+            mv = memoryview(buf)
+            while mv:
+                if f_out is None:
+                    chunk_filename = f"{base}.part{chunk_num:03d}"
+                    chunk_files.append(chunk_filename)
+                    f_out = open(os.path.join(chunks_dir, chunk_filename), "wb")
+                take = min(chunk_size - chunk_fill, LEAF_SIZE - leaf_fill, len(mv))
+                f_out.write(mv[:take])
+                leaf_h.update(mv[:take])
+                chunk_fill += take
+                leaf_fill += take
+                downloaded += take
+                mv = mv[take:]
+                if leaf_fill == LEAF_SIZE:
+                    leaves.append(leaf_h.digest())
+                    leaf_h = hashlib.sha256()
+                    leaf_fill = 0
+                if chunk_fill == chunk_size:
+                    finish_chunk()
+            draw_progress("Download+chunk", downloaded, total)
+        if f_out is not None:
+            finish_chunk()
+    return chunk_files
+
+def download_into_chunks(download_link, file_name, chunks_dir, manifest_path,
+                         chunk_size=CHUNK_SIZE_BYTES):
+    """
+    Download an HTTP(S) original straight into chunk files + manifest,
+    never materializing the monolithic file on disk: half the producer's
+    disk writes, and staging space shrinks to the chunks alone.
+    Uses per-chunk parallel Range requests when the server supports them,
+    else one fused streaming pass. Returns the list of chunk filenames.
+    """
     if requests is None:
         raise RuntimeError("requests not installed; needed for regular HTTP download.")
+    os.makedirs(chunks_dir, exist_ok=True)
+    base = os.path.basename(file_name)
 
-    cwd = os.getcwd()
-    full_output_path = os.path.join(cwd, file_name)
+    # Probe size + Range support once; range downloads need both.
+    total_size = -1
+    ranges_ok = False
+    try:
+        head = requests.head(download_link, allow_redirects=True, timeout=10)
+        total_size = int(head.headers.get("Content-Length", -1))
+        ranges_ok = head.headers.get("Accept-Ranges", "").lower() == "bytes"
+    except Exception:
+        pass
 
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            resp = requests.get(download_link, stream=True)
-            resp.raise_for_status()
-            total = int(resp.headers.get("Content-Length", 0)) or None
-            downloaded = 0
-
-            with open(full_output_path, "wb") as f:
-                for chunk in resp.iter_content(chunk_size=51200):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total:
-                            draw_progress("Download original", downloaded, total)
-            print(f"\nFile downloaded successfully: {full_output_path}")
-            return full_output_path
+            if ranges_ok and total_size > 0:
+                chunk_files = _ranged_download_into_chunks(
+                    download_link, base, chunks_dir, manifest_path, total_size, chunk_size
+                )
+            else:
+                chunk_files = _stream_download_into_chunks(
+                    download_link, base, chunks_dir, manifest_path, chunk_size
+                )
+            print(f"\nDownloaded into {len(chunk_files)} chunks in '{chunks_dir}'.")
+            print(f"Manifest saved: {manifest_path}")
+            return chunk_files
         except Exception as e:
             print(f"Download attempt {attempt+1} failed: {e}")
             if attempt < max_retries - 1:
@@ -233,6 +616,10 @@ def download_torrent_magnet(download_link, file_name_hint):
     with warnings.catch_warnings():
         warnings.simplefilter("ignore", category=DeprecationWarning)
         ses = lt.session()
+        # Event-driven progress: block on libtorrent's alert queue instead
+        # of polling handle.status() in a 1 s loop, which serializes with
+        # the engine's internal threads under the GIL.
+        ses.set_alert_mask(lt.alert.category_t.status_notification)
         params = {
             "save_path": "./",
             "storage_mode": lt.storage_mode_t(2),
@@ -240,31 +627,36 @@ def download_torrent_magnet(download_link, file_name_hint):
         handle = lt.add_magnet_uri(ses, download_link, params)
         sys.stdout.write("Downloading metadata...\n")
         sys.stdout.flush()
-        while not handle.has_metadata():
-            time.sleep(1)
+
+        state_str = [
+            "queued", "checking", "downloading metadata",
+            "downloading", "finished", "seeding",
+            "allocating", "checking fastresume",
+        ]
+        have_metadata = False
+        finished = False
+        while not finished:
+            ses.wait_for_alert(1000)  # ms; returns early on any alert
+            for alert in ses.pop_alerts():
+                if isinstance(alert, lt.metadata_received_alert) and not have_metadata:
+                    have_metadata = True
+                    sys.stdout.write("Metadata downloaded, starting torrent download...\n")
+                    sys.stdout.flush()
+                elif isinstance(alert, lt.torrent_finished_alert):
+                    finished = True
+            if have_metadata and not finished:
+                s = handle.status()
+                progress = (
+                    f"{s.progress * 100:.2f}% complete "
+                    f"(down: {s.download_rate/1000:.1f} kB/s "
+                    f"up: {s.upload_rate/1000:.1f} kB/s "
+                    f"peers: {s.num_peers} {state_str[s.state]})"
+                )
+                sys.stdout.write("\r" + progress)
+                sys.stdout.flush()
 
         info = handle.get_torrent_info()
         torrent_name = info.name()
-        sys.stdout.write("Metadata downloaded, starting torrent download...\n")
-        sys.stdout.flush()
-
-        while handle.status().state != lt.torrent_status.seeding:
-            s = handle.status()
-            state_str = [
-                "queued", "checking", "downloading metadata",
-                "downloading", "finished", "seeding",
-                "allocating", "checking fastresume",
-            ]
-            progress = (
-                f"{s.progress * 100:.2f}% complete "
-                f"(down: {s.download_rate/1000:.1f} kB/s "
-                f"up: {s.upload_rate/1000:.1f} kB/s "
-                f"peers: {s.num_peers} {state_str[s.state]})"
-            )
-            sys.stdout.write("\r" + progress)
-            sys.stdout.flush()
-            time.sleep(1)
-
         sys.stdout.write("\nTorrent download complete.\n")
         sys.stdout.flush()
 
@@ -273,7 +665,7 @@ def download_torrent_magnet(download_link, file_name_hint):
         if os.path.isdir(torrent_name):
             zip_name = out_name + ".zip"
             print("Zipping torrent folder into:", zip_name)
-            subprocess.run(["zip", "-r", zip_name, torrent_name], check=True)
+            shutil.make_archive(out_name, "zip", root_dir=".", base_dir=torrent_name)
             return zip_name
         else:
             # Single file torrent
@@ -283,7 +675,59 @@ def download_torrent_magnet(download_link, file_name_hint):
 # Chunking + manifest
 # =========================
 
-def split_file_into_chunks(file_path, chunks_dir, chunk_size=CHUNK_SIZE_BYTES):
+# Inner copy/hash granularity for the split loop.
+SPLIT_READ_SIZE = 8 * 1024 * 1024
+
+def _copy_range(in_file, out_file, offset, count, progress=None, mm=None):
+    """
+    Copy `count` bytes of `in_file` starting at `offset` into `out_file`.
+    Prefers os.copy_file_range (in-kernel, no user-space buffer), then
+    os.sendfile, then a user-space loop — writing zero-copy slices of the
+    `mm` mapping of the source when given, else plain read/write.
+    Returns bytes copied.
+    """
+    in_fd = in_file.fileno()
+    out_fd = out_file.fileno()
+    copied = 0
+    while copied < count:
+        want = min(SPLIT_READ_SIZE, count - copied)
+        try:
+            if hasattr(os, "copy_file_range"):
+                sent = os.copy_file_range(in_fd, out_fd, want, offset_src=offset + copied)
+            else:
+                sent = os.sendfile(out_fd, in_fd, offset + copied, want)
+        except (AttributeError, OSError):
+            # e.g. cross-device copy on older kernels, or platforms where
+            # sendfile only accepts sockets — copy through user space.
+            if mm is not None:
+                with memoryview(mm)[offset + copied:offset + copied + want] as buf:
+                    sent = os.write(out_fd, buf)
+            else:
+                in_file.seek(offset + copied)
+                buf = in_file.read(want)
+                if not buf:
+                    break
+                sent = os.write(out_fd, buf)
+        if sent == 0:
+            break
+        copied += sent
+        if progress:
+            progress(sent)
+    return copied
+
+def preallocate(fd, size):
+    """
+    Reserve `size` bytes for `fd` up front so the filesystem allocates
+    extents once instead of growing the file write by write.
+    """
+    if size <= 0 or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError:
+        pass
+
+def split_file_into_chunks(file_path, chunks_dir, manifest_path, chunk_size=CHUNK_SIZE_BYTES):
     os.makedirs(chunks_dir, exist_ok=True)
     base = os.path.basename(file_path)
     size = os.path.getsize(file_path)
@@ -291,64 +735,184 @@ def split_file_into_chunks(file_path, chunks_dir, chunk_size=CHUNK_SIZE_BYTES):
 
     chunk_num = 0
     total_bytes_read = 0
-
-    with open(file_path, "rb") as f_in:
-        while True:
-            chunk = f_in.read(chunk_size)
-            if not chunk:
-                break
+    chunk_files = []
+
+    def on_copied(n):
+        nonlocal total_bytes_read
+        total_bytes_read += n
+        draw_progress("Chunking", total_bytes_read, size)
+
+    with open(file_path, "rb") as f_in, open(manifest_path, "w") as mf:
+        # Map the source once: the kernel copy leaves the data hot in the
+        # page cache, and hashing reads it back through the same mapping
+        # without allocating Python-level buffers.
+        mm = None
+        if size > 0:
+            try:
+                mm = mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ)
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    # One forward pass: let the kernel read ahead aggressively
+                    # and drop pages behind us instead of caching the file.
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+            except (OSError, ValueError):
+                mm = None
+
+        while total_bytes_read < size:
             chunk_filename = f"{base}.part{chunk_num:03d}"
             chunk_path = os.path.join(chunks_dir, chunk_filename)
+            start = total_bytes_read
+            this_chunk = min(chunk_size, size - start)
+
             with open(chunk_path, "wb") as f_out:
-                f_out.write(chunk)
-            total_bytes_read += len(chunk)
-            draw_progress("Chunking", total_bytes_read, size)
+                copied = _copy_range(f_in, f_out, start, this_chunk, progress=on_copied, mm=mm)
+
+            leaves = []
+            if mm is not None:
+                view = memoryview(mm)
+                for off in range(start, start + copied, LEAF_SIZE):
+                    leaves.append(
+                        hashlib.sha256(view[off:min(off + LEAF_SIZE, start + copied)]).digest()
+                    )
+                view.release()
+            else:
+                f_in.seek(start)
+                remaining = copied
+                while remaining > 0:
+                    buf = f_in.read(min(LEAF_SIZE, remaining))
+                    if not buf:
+                        break
+                    leaves.append(hashlib.sha256(buf).digest())
+                    remaining -= len(buf)
+            leaves_hex = "".join(digest.hex() for digest in leaves)
+            mf.write(f"{merkle_root(leaves)}  {chunk_filename}  {leaves_hex}\n")
+            chunk_files.append(chunk_filename)
             print(f"  Created chunk: {chunk_path}")
             chunk_num += 1
 
-    print(f"File '{file_path}' split into {chunk_num} chunks in '{chunks_dir}'.")
-    return chunk_num
-
-def create_manifest(chunks_dir, manifest_path):
-    files = [
-        f for f in os.listdir(chunks_dir)
-        if os.path.isfile(os.path.join(chunks_dir, f))
-    ]
-    files = sorted(files)
-    print(f"Creating manifest for {len(files)} chunks...")
+        if mm is not None:
+            mm.close()
 
-    with open(manifest_path, "w") as mf:
-        for fname in files:
-            full_path = os.path.join(chunks_dir, fname)
-            checksum = sha256_file(full_path)
-            mf.write(f"{checksum}  {fname}\n")
+    print(f"File '{file_path}' split into {chunk_num} chunks in '{chunks_dir}'.")
     print(f"Manifest saved: {manifest_path}")
-    return files
+    return chunk_files
+
+def _is_leaf_field(field):
+    """True if `field` looks like concatenated hex leaf digests."""
+    if not field or len(field) % 64 != 0:
+        return False
+    return all(c in "0123456789abcdef" for c in field)
 
 def load_manifest(manifest_path):
+    """
+    Parse manifest lines of the form
+        <digest>  <filename>  [<concatenated hex leaf digests>]
+    Returns {filename: (digest, [raw leaf digests])}. Manifests written by
+    older versions carry no leaf field and get an empty leaf list (their
+    digest is a plain whole-chunk SHA-256).
+    """
     manifest = {}
     with open(manifest_path, "r") as mf:
         for line in mf:
             line = line.strip()
             if not line:
                 continue
-            checksum, fname = line.split(maxsplit=1)
-            manifest[fname.strip()] = checksum.strip()
+            checksum, rest = line.split(maxsplit=1)
+            fname = rest.strip()
+            leaves = []
+            if "  " in fname:
+                maybe_name, maybe_leaves = fname.rsplit("  ", 1)
+                if _is_leaf_field(maybe_leaves):
+                    fname = maybe_name.strip()
+                    leaves = [
+                        bytes.fromhex(maybe_leaves[i:i + 64])
+                        for i in range(0, len(maybe_leaves), 64)
+                    ]
+            manifest[fname] = (checksum.strip(), leaves)
     return manifest
 
 # =========================
 # Producer mode (VPS)
 # =========================
 
+def upload_chunks_pipelined(session, chunks_dir, chunk_files, remote_chunks_url):
+    """
+    Upload chunks with a worker thread while the main thread waits for the
+    consumer to delete already-uploaded chunks. Uploading chunk N+1 then
+    overlaps with the consumer draining chunk N, so throughput becomes
+    max(upload, consumer) instead of their sum. The bounded queue caps how
+    many unacknowledged chunks can sit on the DMS at once.
+    """
+    total_bytes = sum(os.path.getsize(os.path.join(chunks_dir, f)) for f in chunk_files)
+    in_flight = queue.Queue(maxsize=2)
+
+    def upload_worker():
+        for fname in chunk_files:
+            local_chunk_path = os.path.join(chunks_dir, fname)
+            remote_chunk_url = remote_chunks_url + fname
+
+            # Before uploading, ensure DMS has enough free space for this chunk.
+            # One PROPFIND yields both the quota and the folder listing.
+            chunk_size = os.path.getsize(local_chunk_path)
+            counter = 0
+            while True:
+                avail_dms, _listing = dms_status(session, remote_chunks_url)
+                # If we couldn't determine DMS quota, warn and proceed with upload
+                if avail_dms < 0:
+                    print(f"Warning: could not determine DMS free space; proceeding to upload {fname}.")
+                    break
+                if avail_dms >= chunk_size:
+                    # Enough space — proceed to upload
+                    break
+                # Not enough space — wait for consumer to delete chunks
+                if counter % 5 == 0:
+                    print(
+                        f"Not enough DMS space to upload {fname}: need {chunk_size/1e9:.2f} GB, "
+                        f"available {avail_dms/1e9:.2f} GB. Waiting for consumer to free space..."
+                    )
+                time.sleep(10)
+                counter += 1
+
+            dms_upload_file(session, local_chunk_path, remote_chunk_url, fname)
+            # Signal the consumer that this chunk is complete on the DMS.
+            dms_put_marker(session, remote_chunks_url + READY_PREFIX + fname)
+            in_flight.put((fname, remote_chunk_url, chunk_size))
+        in_flight.put(None)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        worker = executor.submit(upload_worker)
+        uploaded_bytes = 0
+        while True:
+            item = in_flight.get()
+            if item is None:
+                break
+            fname, remote_chunk_url, chunk_size = item
+
+            # Wait for the consumer's ack marker. The notebook consumer
+            # predates the markers and only signals consumption by deleting
+            # the chunk, so the chunk disappearing counts as an ack too.
+            print(f"Waiting for consumer to acknowledge {fname}...")
+            ack_name = ACK_PREFIX + fname
+            poll_dms_listing(session, remote_chunks_url, ack_name,
+                             until_present=True, gone_fname=fname)
+            # Clear both markers; whichever a marker-less consumer left
+            # untouched deletes as a no-op (404).
+            dms_delete(session, remote_chunks_url + ack_name)
+            dms_delete(session, remote_chunks_url + READY_PREFIX + fname)
+
+            # Update global progress
+            uploaded_bytes += chunk_size
+            draw_progress("Total upload", uploaded_bytes, total_bytes)
+        worker.result()
+
 def producer_mode():
     print("=== PRODUCER MODE (VPS) ===")
 
     dms_user = input("DMS Username: ").strip()
     dms_pass = input("DMS Password: ").strip()
-    login_detail = build_login_detail(dms_user, dms_pass)
+    session = make_session(dms_user, dms_pass)
 
     # ----- SHOW DMS QUOTA -----
-    used_dms, avail_dms = get_dms_quota(login_detail)
+    used_dms, avail_dms = get_dms_quota(session)
     if used_dms >= 0 and avail_dms >= 0:
         print(f"\nDMS Used     : {used_dms/1e9:.2f} GB")
         print(f"DMS Available: {avail_dms/1e9:.2f} GB\n")
@@ -377,7 +941,8 @@ def producer_mode():
         sys.exit(1)
 
     # ----- STORAGE CHECKS -----
-    # VPS: we need space for at least the file OR one chunk, whichever is larger
+    # VPS: HTTP downloads stream straight into chunk files, so staging only
+    # needs the chunks (~file size). Torrents still stage the original too.
     required_vps = CHUNK_SIZE_BYTES
     if remote_size > 0:
         required_vps = max(remote_size, CHUNK_SIZE_BYTES)
@@ -396,76 +961,39 @@ def producer_mode():
 
     print("\nStorage checks passed. Proceeding...\n")
 
-    # Step 3: Download original file on VPS
+    # Step 3 + 4: Download and chunk (+ manifest)
+    chunks_dir = CHUNKS_DIR_LOCAL
+    manifest_path = os.path.join(chunks_dir, MANIFEST_NAME)
     if download_link.startswith("magnet:?xt=urn:btih:"):
+        # Torrents need random-access writes, so the original is staged
+        # on disk first and then split in one pass.
         original_path = download_torrent_magnet(download_link, file_name)
+        chunk_files = split_file_into_chunks(original_path, chunks_dir, manifest_path, CHUNK_SIZE_BYTES)
     else:
-        original_path = download_regular_file(download_link, file_name)
-
-    # Step 4: Chunk + manifest
-    chunks_dir = CHUNKS_DIR_LOCAL
-    split_file_into_chunks(original_path, chunks_dir, CHUNK_SIZE_BYTES)
-    manifest_path = os.path.join(chunks_dir, MANIFEST_NAME)
-    chunk_files = create_manifest(chunks_dir, manifest_path)
+        # HTTP streams straight into chunk files; no monolithic original.
+        original_path = None
+        chunk_files = download_into_chunks(download_link, file_name, chunks_dir, manifest_path, CHUNK_SIZE_BYTES)
 
     # Step 5: Upload manifest + chunks one-by-one to DMS, wait for consumer
     remote_chunks_url = DMS_BASE + CHUNKS_DIR_REMOTE
-    dms_mkcol(login_detail, remote_chunks_url)
+    dms_mkcol(session, remote_chunks_url)
 
     # Upload manifest first
     remote_manifest_url = remote_chunks_url + MANIFEST_NAME
-    dms_upload_file(login_detail, manifest_path, remote_manifest_url, MANIFEST_NAME)
-
-    print("Manifest uploaded. Now uploading chunks one by one...")
-
-    total_bytes = sum(os.path.getsize(os.path.join(chunks_dir, f)) for f in chunk_files)
-    uploaded_bytes = 0
-
-    for fname in chunk_files:
-        local_chunk_path = os.path.join(chunks_dir, fname)
-        remote_chunk_url = remote_chunks_url + fname
+    dms_upload_file(session, manifest_path, remote_manifest_url, MANIFEST_NAME)
 
-        # Before uploading, ensure DMS has enough free space for this chunk.
-        chunk_size = os.path.getsize(local_chunk_path)
-        while True:
-            counter = 0
-            used_dms, avail_dms = get_dms_quota(login_detail)
-            # If we couldn't determine DMS quota, warn and proceed with upload
-            if avail_dms < 0:
-                print(f"Warning: could not determine DMS free space; proceeding to upload {fname}.")
-                break
-            if avail_dms >= chunk_size:
-                # Enough space — proceed to upload
-                break
-            # Not enough space — wait for consumer to delete chunks
-            if counter % 5 == 0:
-                print(
-                    f"Not enough DMS space to upload {fname}: need {chunk_size/1e9:.2f} GB, "
-                    f"available {avail_dms/1e9:.2f} GB. Waiting for consumer to free space..."
-                )
-            time.sleep(10)
-            counter += 1
-
-        # Upload
-        dms_upload_file(login_detail, local_chunk_path, remote_chunk_url, fname)
-
-        # Wait for consumer to delete
-        print(f"Waiting for consumer to delete {fname} from DMS...")
-        while dms_exists(login_detail, remote_chunk_url):
-            time.sleep(5)
-
-        # Update global progress
-        uploaded_bytes += os.path.getsize(local_chunk_path)
-        draw_progress("Total upload", uploaded_bytes, total_bytes)
+    print("Manifest uploaded. Now uploading chunks...")
+    upload_chunks_pipelined(session, chunks_dir, chunk_files, remote_chunks_url)
 
     print("\nAll chunks uploaded and acknowledged by consumer.")
 
     # Cleanup on VPS
-    try:
-        os.remove(original_path)
-        print(f"Removed original file: {original_path}")
-    except Exception:
-        pass
+    if original_path is not None:
+        try:
+            os.remove(original_path)
+            print(f"Removed original file: {original_path}")
+        except Exception:
+            pass
     shutil.rmtree(chunks_dir, ignore_errors=True)
     print("Producer cleanup done.")
 
@@ -478,7 +1006,7 @@ def consumer_mode():
 
     dms_user = input("DMS Username: ").strip()
     dms_pass = input("DMS Password: ").strip()
-    login_detail = build_login_detail(dms_user, dms_pass)
+    session = make_session(dms_user, dms_pass)
 
     # Step 1: Download manifest from DMS
     remote_chunks_url = DMS_BASE + CHUNKS_DIR_REMOTE
@@ -486,10 +1014,9 @@ def consumer_mode():
     local_manifest_path = MANIFEST_NAME
 
     print("Waiting for manifest.txt to appear on DMS...")
-    while not dms_exists(login_detail, remote_manifest_url):
-        time.sleep(5)
+    poll_dms_listing(session, remote_chunks_url, MANIFEST_NAME, until_present=True)
 
-    dms_download_file(login_detail, remote_manifest_url, local_manifest_path, MANIFEST_NAME)
+    dms_download_file(session, remote_manifest_url, local_manifest_path, MANIFEST_NAME)
 
     manifest = load_manifest(local_manifest_path)
     chunk_files = sorted(manifest.keys())
@@ -502,34 +1029,62 @@ def consumer_mode():
     for fname in chunk_files:
         remote_chunk_url = remote_chunks_url + fname
         local_chunk_path = os.path.join(CHUNKS_DIR_LOCAL, fname)
-        expected_hash = manifest[fname]
+        expected_hash, expected_leaves = manifest[fname]
 
         print(f"\n=== Handling chunk: {fname} ===")
-        print("Waiting for chunk to appear on DMS...")
-        while not dms_exists(login_detail, remote_chunk_url):
-            time.sleep(5)
+        print("Waiting for chunk to be ready on DMS...")
+        if expected_leaves:
+            # The ready marker only appears once the producer's PUT finished,
+            # so a partially uploaded chunk can never be picked up.
+            poll_dms_listing(session, remote_chunks_url, READY_PREFIX + fname, until_present=True)
+        else:
+            # A two-field manifest means the notebook producer, which writes
+            # no markers: the chunk itself appearing is the only signal, and
+            # the checksum retries below cover an in-flight upload.
+            poll_dms_listing(session, remote_chunks_url, fname, until_present=True)
 
-        # Download + verify with retries
+        # Download + verify (hashed while streaming) with retries
         max_attempts = 3
         ok = False
         for attempt in range(1, max_attempts + 1):
-            dms_download_file(login_detail, remote_chunk_url, local_chunk_path, fname)
-            actual_hash = sha256_file(local_chunk_path)
-            if actual_hash.lower() == expected_hash.lower():
+            actual_hash, actual_leaves = download_and_hash(
+                session, remote_chunk_url, local_chunk_path, fname,
+                leaf_based=bool(expected_leaves),
+            )
+            if actual_hash is not None and actual_hash.lower() == expected_hash.lower():
                 print(f"Checksum OK for {fname}")
                 ok = True
                 break
-            else:
-                print(f"Checksum mismatch for {fname} (attempt {attempt})")
+            print(f"Checksum mismatch for {fname} (attempt {attempt})")
+            # With leaf digests available, patch just the bad leaves
+            # instead of re-downloading the whole chunk.
+            if (
+                actual_hash is not None
+                and expected_leaves
+                and repair_chunk_leaves(
+                    session, remote_chunk_url, local_chunk_path,
+                    expected_leaves, actual_leaves, fname,
+                )
+            ):
+                print(f"Checksum OK for {fname} (after leaf repair)")
+                ok = True
+                break
+            if os.path.exists(local_chunk_path):
                 os.remove(local_chunk_path)
-                time.sleep(3)
+            time.sleep(3)
 
         if not ok:
             print(f"Failed to obtain valid chunk {fname} after {max_attempts} attempts. Aborting.")
             sys.exit(1)
 
-        # Delete from DMS
-        dms_delete(login_detail, remote_chunk_url, label=fname)
+        # Acknowledge, then free the quota. The ack must exist before the
+        # chunk disappears, since our producer also treats chunk deletion
+        # as a legacy ack; it cleans up both markers afterwards. A marker-
+        # less notebook producer only sees the deletion, which is all it
+        # ever expected.
+        if expected_leaves:
+            dms_put_marker(session, remote_chunks_url + ACK_PREFIX + fname)
+        dms_delete(session, remote_chunk_url, label=fname)
 
         # Update global "combined" progress
         chunks_done += 1
@@ -563,20 +1118,30 @@ def consumer_mode():
         output_path = base_name
         print(f"\nMerging {len(group_files)} chunks into: {output_path}")
         
+        chunk_paths = [os.path.join(CHUNKS_DIR_LOCAL, f) for f in group_files]
+        total_size = sum(os.path.getsize(p) for p in chunk_paths)
         with open(output_path, "wb") as out_f:
-            for fname in group_files:
-                chunk_path = os.path.join(CHUNKS_DIR_LOCAL, fname)
-                with open(chunk_path, "rb") as in_f:
-                    while True:
-                        data = in_f.read(1024 * 1024)
-                        if not data:
-                            break
-                        out_f.write(data)
+            # Final size is known from the chunks; reserve it in one go.
+            preallocate(out_f.fileno(), total_size)
+            copied = 0
+            try:
+                for chunk_path in chunk_paths:
+                    with open(chunk_path, "rb") as in_f:
+                        # In-kernel copy: no 1 MiB Python buffers, and the kernel
+                        # overlaps readahead with the writeback itself.
+                        copied += _copy_range(in_f, out_f, 0, os.path.getsize(chunk_path))
+            except BaseException:
+                # preallocate() already extended the file to its final size,
+                # so an aborted merge would otherwise look complete with a
+                # zero-filled tail. Truncate back to the bytes actually
+                # copied before re-raising.
+                os.ftruncate(out_f.fileno(), copied)
+                raise
         
         print(f"✓ Merged file written to: {output_path}")
 
     # Cleanup on DMS: delete manifest
-    dms_delete(login_detail, remote_manifest_url, label=MANIFEST_NAME)
+    dms_delete(session, remote_manifest_url, label=MANIFEST_NAME)
 
     # Cleanup on laptop
     shutil.rmtree(CHUNKS_DIR_LOCAL, ignore_errors=True)
@@ -597,6 +1162,8 @@ def main():
                         help="producer (run on VPS) or consumer (run on laptop)")
     args = parser.parse_args()
 
+    check_hash_acceleration()
+
     if args.mode == "producer":
         producer_mode()
     else:
@@ -9,17 +9,96 @@ import hashlib
 from pathlib import Path
 
 
+# Must match dms_chunk_sync.py: chunks are hashed as SHA-256 per 4 MiB
+# leaf, with the manifest digest being SHA-256 over the raw leaf digests.
+LEAF_SIZE = 4 * 1024 * 1024
+
+
 def calculate_sha256(filepath):
     """Calculate SHA256 checksum of a file."""
-    sha256_hash = hashlib.sha256()
+    with open(filepath, "rb", buffering=0) as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        # Fallback for older Pythons: readinto a single reused 1 MiB
+        # buffer, so the loop allocates nothing per block
+        sha256_hash = hashlib.sha256()
+        buf = bytearray(1 << 20)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            sha256_hash.update(view[:n])
+        return sha256_hash.hexdigest()
+
+
+def calculate_tree_digest(filepath):
+    """Calculate the leaf-based tree digest of a file."""
+    root = hashlib.sha256()
+    buf = bytearray(LEAF_SIZE)
+    view = memoryview(buf)
     with open(filepath, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+        # buffered readinto fills the whole leaf except at EOF, and reusing
+        # the buffer avoids a 4 MiB allocation per leaf
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            root.update(hashlib.sha256(view[:n]).digest())
+    return root.hexdigest()
+
+
+# Block size for the user-space copy fallback.
+COPY_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+def copy_file_data(in_file, out_file, count):
+    """
+    Append `count` bytes of `in_file` to `out_file` using an in-kernel copy
+    (copy_file_range, then sendfile), falling back to a read/write loop.
+    """
+    in_fd = in_file.fileno()
+    out_fd = out_file.fileno()
+    copied = 0
+    while copied < count:
+        want = min(COPY_BLOCK_SIZE, count - copied)
+        try:
+            if hasattr(os, "copy_file_range"):
+                sent = os.copy_file_range(in_fd, out_fd, want, offset_src=copied)
+            else:
+                sent = os.sendfile(out_fd, in_fd, copied, want)
+        except (AttributeError, OSError):
+            in_file.seek(copied)
+            buf = in_file.read(want)
+            if not buf:
+                break
+            sent = os.write(out_fd, buf)
+        if sent == 0:
+            break
+        copied += sent
+    return copied
+
+
+def preallocate(fd, size):
+    """
+    Reserve `size` bytes for `fd` up front so the filesystem allocates
+    extents once instead of growing the file write by write.
+    """
+    if size <= 0 or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError:
+        pass
 
 
 def read_manifest(manifest_path):
-    """Read manifest file and return dict of {filename: expected_checksum}."""
+    """
+    Read manifest file and return dict of {filename: (checksum, leaf_based)}.
+    Lines may carry a third field of concatenated hex leaf digests (written
+    by current dms_chunk_sync.py); two-field lines are older manifests whose
+    checksum is a plain whole-chunk SHA256.
+    """
     manifest = {}
     with open(manifest_path, 'r') as f:
         for line in f:
@@ -28,7 +107,10 @@ def read_manifest(manifest_path):
                 parts = line.split()
                 if len(parts) == 2:
                     checksum, filename = parts
-                    manifest[filename] = checksum
+                    manifest[filename] = (checksum, False)
+                elif len(parts) == 3:
+                    checksum, filename, _leaves = parts
+                    manifest[filename] = (checksum, True)
     return manifest
 
 
@@ -96,8 +178,11 @@ def merge_chunks(manifest_path, chunks_dir, output_dir=None):
                 continue
             
             print(f"  Verifying: {chunk_name}...", end=" ")
-            actual_checksum = calculate_sha256(chunk_path)
-            expected_checksum = manifest[chunk_name]
+            expected_checksum, leaf_based = manifest[chunk_name]
+            if leaf_based:
+                actual_checksum = calculate_tree_digest(chunk_path)
+            else:
+                actual_checksum = calculate_sha256(chunk_path)
             
             if actual_checksum == expected_checksum:
                 print("✓")
@@ -113,11 +198,23 @@ def merge_chunks(manifest_path, chunks_dir, output_dir=None):
         
         # Merge chunks
         print(f"  Merging into: {output_file}")
+        total_size = sum(os.path.getsize(chunks_dir / c) for c in chunk_list)
         with open(output_file, 'wb') as outfile:
-            for chunk_name in chunk_list:
-                chunk_path = chunks_dir / chunk_name
-                with open(chunk_path, 'rb') as infile:
-                    outfile.write(infile.read())
+            # Final size is known from the chunks; reserve it in one go.
+            preallocate(outfile.fileno(), total_size)
+            copied = 0
+            try:
+                for chunk_name in chunk_list:
+                    chunk_path = chunks_dir / chunk_name
+                    with open(chunk_path, 'rb') as infile:
+                        copied += copy_file_data(infile, outfile, os.path.getsize(chunk_path))
+            except BaseException:
+                # preallocate() already extended the file to its final size,
+                # so an aborted merge would otherwise look complete with a
+                # zero-filled tail. Truncate back to the bytes actually
+                # copied before re-raising.
+                os.ftruncate(outfile.fileno(), copied)
+                raise
         
         print(f"  ✓ Successfully merged {base_name}\n")
 